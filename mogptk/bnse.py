@@ -59,13 +59,13 @@ class bse:
         dKdsigma = 2*Gram/sigma
         dKdgamma = -Gram*(outersum(self.x,-self.x)**2)
         dKdtheta = -2*np.pi*Spec_Mix_sine(self.x,self.x, gamma, theta, sigma)*outersum(self.x,-self.x)
-        dKdsigma_n = 2*sigma_n*np.eye(self.Nx)
 
+        # trace(H@dK) equals sum(H*dK.T), which avoids the O(N^3) matrix products
         H = (np.outer(h,h) - np.linalg.inv(K))
-        dlogp_dsigma = sigma * 0.5*np.trace(H@dKdsigma)
-        dlogp_dgamma = gamma * 0.5*np.trace(H@dKdgamma)
-        dlogp_dtheta = theta * 0.5*np.trace(H@dKdtheta)
-        dlogp_dsigma_n = sigma_n * 0.5*np.trace(H@dKdsigma_n)
+        dlogp_dsigma = sigma * 0.5*np.sum(H*dKdsigma.T)
+        dlogp_dgamma = gamma * 0.5*np.sum(H*dKdgamma.T)
+        dlogp_dtheta = theta * 0.5*np.sum(H*dKdtheta.T)
+        dlogp_dsigma_n = sigma_n * 0.5*np.trace(H)*2*sigma_n
         return np.array([-dlogp_dsigma, -dlogp_dgamma, -dlogp_dtheta, -dlogp_dsigma_n])
 
     def train(self):
@@ -81,16 +81,23 @@ class bse:
         cov_space = Spec_Mix(self.x,self.x,self.gamma,self.theta,self.sigma) + 1e-5*np.eye(self.Nx) + self.sigma_n**2*np.eye(self.Nx)
         cov_time = Spec_Mix(self.time,self.time, self.gamma, self.theta, self.sigma)
         cov_star = Spec_Mix(self.time,self.x, self.gamma, self.theta, self.sigma)
-        self.post_mean = np.squeeze(cov_star@np.linalg.solve(cov_space,self.y))
-        self.post_cov = cov_time - (cov_star@np.linalg.solve(cov_space,cov_star.T))
-
-        #posterior moment for frequency
         cov_real, cov_imag = freq_covariances(self.w,self.w,self.alpha,self.gamma,self.theta,self.sigma, kernel = 'sm')
         xcov_real, xcov_imag = time_freq_covariances(self.w, self.x, self.alpha,self.gamma,self.theta,self.sigma, kernel = 'sm')
-        self.post_mean_r = np.squeeze(xcov_real@np.linalg.solve(cov_space,self.y))
-        self.post_cov_r = cov_real - (xcov_real@np.linalg.solve(cov_space,xcov_real.T))
-        self.post_mean_i = np.squeeze(xcov_imag@np.linalg.solve(cov_space,self.y))
-        self.post_cov_i = cov_imag - (xcov_imag@np.linalg.solve(cov_space,xcov_imag.T))
+
+        # solve for all right-hand sides at once so that cov_space is factorized only once
+        rhs = np.concatenate([self.y.reshape(-1,1), cov_star.T, xcov_real.T, xcov_imag.T], axis=1)
+        sol = np.linalg.solve(cov_space,rhs)
+        sol_y, sol_star, sol_real, sol_imag = np.split(sol, np.cumsum([1, len(self.time), len(self.w)]), axis=1)
+        sol_y = sol_y[:,0]
+
+        self.post_mean = np.squeeze(cov_star@sol_y)
+        self.post_cov = cov_time - (cov_star@sol_star)
+
+        #posterior moment for frequency
+        self.post_mean_r = np.squeeze(xcov_real@sol_y)
+        self.post_cov_r = cov_real - (xcov_real@sol_real)
+        self.post_mean_i = np.squeeze(xcov_imag@sol_y)
+        self.post_cov_i = cov_imag - (xcov_imag@sol_imag)
         self.posterior_mean_psd = self.post_mean_r**2 + self.post_mean_i**2 + np.diag(self.post_cov_r + self.post_cov_r)
         return cov_real, xcov_real, cov_space, self.w, self.posterior_mean_psd
 
@@ -127,7 +127,7 @@ class Data:
             X (list, numpy.ndarray, dict): Independent variable data of shape (n,) or (n,input_dims).
             Y (list, numpy.ndarray): Dependent variable data of shape (n,).
             name (str): Name of data.
-            x_labels (str, list of str): Name or names of input dimensions.
+            x_labels (str, list or tuple of str): Name or names of input dimensions.
             y_label (str): Name of output dimension.
 
         Examples:
@@ -138,7 +138,7 @@ class Data:
         if x_labels is not None:
             if isinstance(x_labels, str):
                 x_labels = [x_labels]
-            if not isinstance(x_labels, list) or not all(isinstance(label, str) for label in x_labels):
+            if not isinstance(x_labels, (list, tuple)) or not all(isinstance(label, str) for label in x_labels):
                 raise ValueError("x_labels must be a string or list of strings for each input dimension")
 
             if isinstance(X, dict):
@@ -230,7 +230,7 @@ class Data:
         if 1 < input_dims:
             for i in range(input_dims):
                 self.X_labels[i] = 'X%d' % (i,)
-        if isinstance(x_labels, list) and all(isinstance(item, str) for item in x_labels):
+        if isinstance(x_labels, (list, tuple)) and all(isinstance(item, str) for item in x_labels):
             self.X_labels = x_labels
 
         self.name = None
@@ -262,6 +262,29 @@ class Data:
         """
         return copy.deepcopy(self)
 
+    def view(self):
+        """
+        Make a shallow copy of `Data` that shares the underlying X and Y arrays. Since those arrays are read-only, this is much cheaper than `copy()` while transforming, filtering, or removing observations only affects the returned object.
+
+        Returns:
+            mogptk.data.Data
+
+        Examples:
+            >>> other = data.view()
+        """
+        other = copy.copy(self)
+        other.X = [Serie(x, x.transformers, transformed=x.transformed) for x in self.X]
+        other.Y = Serie(self.Y, self.Y.transformers, transformed=self.Y.transformed)
+        other.mask = self.mask.copy()
+        if self.X_pred is self.X:
+            other.X_pred = other.X
+        else:
+            other.X_pred = list(self.X_pred)
+        other.Y_mu_pred = dict(self.Y_mu_pred)
+        other.Y_var_pred = dict(self.Y_var_pred)
+        other.removed_ranges = [list(removed_range) for removed_range in self.removed_ranges]
+        return other
+
     def set_name(self, name):
         """
         Set name for data channel.
@@ -279,7 +302,7 @@ class Data:
         Set axis labels for plots.
 
         Args:
-            x_labels (str, list of str): X data names for each input dimension.
+            x_labels (str, list or tuple of str): X data names for each input dimension.
             y_label (str): Y data name for output dimension.
 
         Examples:
@@ -287,7 +310,7 @@ class Data:
         """
         if isinstance(x_labels, str):
             x_labels = [x_labels]
-        elif not isinstance(x_labels, list) or not all(isinstance(item, str) for item in x_labels):
+        elif not isinstance(x_labels, (list, tuple)) or not all(isinstance(item, str) for item in x_labels):
             raise ValueError("x_labels must be list of strings")
         if not isinstance(y_label, str):
             raise ValueError("y_label must be string")
@@ -898,8 +921,8 @@ class Data:
         C = np.zeros((Q, input_dims))
 
         nyquist = self.get_nyquist_estimation()
+        x, y = np.array([x.transformed[self.mask] for x in self.X]).T, self.Y.transformed[self.mask]
         for i in range(input_dims):
-            x, y = np.array([x.transformed[self.mask] for x in self.X]).T, self.Y.transformed[self.mask]
             bnse = bse(x[:,i], y)
             bnse.set_freqspace(nyquist[i], dimension=n)
             bnse.train()
@@ -986,16 +1009,29 @@ class Data:
         Examples:
             >>> ax = data.plot()
         """
+        self._check_plot_input_dims()
+
+        fig = None
+        if ax is None:
+            fig, ax = plt.subplots(1, 1, figsize=(12, 3.0), squeeze=True, constrained_layout=True)
+
+        legends = self._plot(ax, pred=pred, title=title, transformed=transformed)
+        if legend:
+            legend_rows = (len(legends)-1)/5 + 1
+            ax.legend(handles=legends, loc="upper center", bbox_to_anchor=(0.5,(3.0+0.5+0.3*legend_rows)/3.0), ncol=5)
+
+        if fig is not None:
+            return fig, ax
+
+    def _check_plot_input_dims(self):
         # TODO: ability to plot conditional or marginal distribution to reduce input dims
         if self.get_input_dims() > 2:
             raise ValueError("cannot plot more than two input dimensions")
         if self.get_input_dims() == 2:
             raise NotImplementedError("two dimensional input data not yet implemented") # TODO
 
-        fig = None
-        if ax is None:
-            fig, ax = plt.subplots(1, 1, figsize=(12, 3.0), squeeze=True, constrained_layout=True)
-
+    def _plot(self, ax, pred=None, title=None, transformed=False):
+        # draw to the given axes and return the legend handles
         legends = []
         colors = list(matplotlib.colors.TABLEAU_COLORS)
         for i, name in enumerate(self.Y_mu_pred):
@@ -1067,13 +1103,7 @@ class Data:
         ax.set_xlabel(self.X_labels[0])
         ax.set_ylabel(self.Y_label)
         ax.set_title(self.name if title is None else title, fontsize=14)
-
-        if legend:
-            legend_rows = (len(legends)-1)/5 + 1
-            ax.legend(handles=legends, loc="upper center", bbox_to_anchor=(0.5,(3.0+0.5+0.3*legend_rows)/3.0), ncol=5)
-
-        if fig is not None:
-            return fig, ax
+        return legends
 
     def plot_spectrum(self, title=None, method='ls', ax=None, per=None, maxfreq=None, transformed=False):
         """
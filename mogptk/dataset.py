@@ -15,7 +15,7 @@ def LoadCSV(filename, x_col=0, y_col=1, name=None, **kwargs):
         x_col (int, str, list of int or str): Names or indices of X column(s) in CSV.
         y_col (int, str, list of int or str): Names or indices of Y column(s) in CSV.
         name (str, list): Name or names of data channels.
-        **kwargs: Additional keyword arguments for csv.DictReader.
+        **kwargs: Additional keyword arguments for pandas.read_csv. If `chunksize` is set, the file is read in chunks of that many rows.
 
     Returns:
         mogptk.data.Data or mogptk.dataset.DataSet
@@ -25,9 +25,35 @@ def LoadCSV(filename, x_col=0, y_col=1, name=None, **kwargs):
         <mogptk.dataset.DataSet at ...>
         >>> LoadCSV('gold.csv', 'Date', 'Price', sep=' ', quotechar='|')
         <mogptk.dataset.DataSet at ...>
+        >>> LoadCSV('gold.csv', 'Date', 'Price', chunksize=100000)
+        <mogptk.dataset.DataSet at ...>
     """
 
-    df = pd.read_csv(filename, **kwargs)
+    x_col, x_is_int = _normalize_cols(x_col, 'x_col')
+    y_col, y_is_int = _normalize_cols(y_col, 'y_col')
+
+    # only parse the columns we need, unless the caller selects columns or changes how they are labelled
+    if 'usecols' not in kwargs and 'index_col' not in kwargs and 'names' not in kwargs and not ('header' in kwargs and kwargs['header'] is None):
+        if x_is_int and y_is_int and all(0 <= item for item in x_col + y_col):
+            # pandas keeps the selected columns in file order, so remap the positions to their rank
+            usecols = sorted(set(x_col + y_col))
+            kwargs['usecols'] = usecols
+            x_col = [usecols.index(item) for item in x_col]
+            y_col = [usecols.index(item) for item in y_col]
+        elif not x_is_int and not y_is_int:
+            kwargs['usecols'] = list(dict.fromkeys(x_col + y_col))
+
+    if kwargs.get('chunksize') is not None:
+        # drop rows per chunk that will not end up in any channel
+        chunks = []
+        with pd.read_csv(filename, **kwargs) as reader:
+            for chunk in reader:
+                x_labels = [chunk.columns[item] for item in x_col] if x_is_int else x_col
+                y_labels = [chunk.columns[item] for item in y_col] if y_is_int else y_col
+                chunks.append(chunk.dropna(subset=x_labels).dropna(subset=y_labels, how='all'))
+        df = pd.concat(chunks, ignore_index=True)
+    else:
+        df = pd.read_csv(filename, **kwargs)
 
     return LoadDataFrame(df, x_col, y_col, name)
 
@@ -50,15 +76,8 @@ def LoadDataFrame(df, x_col=0, y_col=1, name=None):
         <mogptk.dataset.DataSet at ...>
     """
 
-    if (not isinstance(x_col, list) or not all(isinstance(item, int) for item in x_col) and not all(isinstance(item, str) for item in x_col)) and not isinstance(x_col, int) and not isinstance(x_col, str):
-        raise ValueError("x_col must be integer, string or list of integers or strings")
-    if (not isinstance(y_col, list) or not all(isinstance(item, int) for item in y_col) and not all(isinstance(item, str) for item in y_col)) and not isinstance(y_col, int) and not isinstance(y_col, str):
-        raise ValueError("y_col must be integer, string or list of integers or strings")
-
-    if not isinstance(x_col, list):
-        x_col = [x_col]
-    if not isinstance(y_col, list):
-        y_col = [y_col]
+    x_col, x_is_int = _normalize_cols(x_col, 'x_col')
+    y_col, y_is_int = _normalize_cols(y_col, 'y_col')
 
     if name is None:
         name = [None] * len(y_col)
@@ -68,33 +87,50 @@ def LoadDataFrame(df, x_col=0, y_col=1, name=None):
         if len(y_col) != len(name):
             raise ValueError("y_col and name must be of the same length")
 
-    # if columns are indices, convert to column names
-    if all(isinstance(item, int) for item in x_col):
+    # resolve columns to their positions, and if columns are indices, convert to column names
+    if x_is_int:
+        x_pos = x_col
         x_col = [df.columns[item] for item in x_col]
-    if all(isinstance(item, int) for item in y_col):
+    else:
+        x_pos = [_get_column_position(df, item) for item in x_col]
+    if y_is_int:
+        y_pos = y_col
         y_col = [df.columns[item] for item in y_col]
+    else:
+        y_pos = [_get_column_position(df, item) for item in y_col]
 
-    df = df[x_col + y_col]
+    df = df.iloc[:, x_pos + y_pos]
     if len(df.index) == 0:
         raise ValueError("dataframe cannot be empty")
 
+    # labels are shared between all channels
+    x_labels = tuple(str(item) for item in x_col)
+    y_labels = [str(item) for item in y_col]
+
+    # convert X and Y once and find rows with missing values, instead of calling dropna for each channel
     input_dims = len(x_col)
-    x_data = df[x_col]
-    x_labels = [str(item) for item in x_col]
+    X = df.iloc[:, :input_dims].to_numpy()
+    Y = df.iloc[:, input_dims:].to_numpy()
+    nan = df.isna().to_numpy()
+    if nan.any():
+        masks = ~(nan[:, :input_dims].any(axis=1, keepdims=True) | nan[:, input_dims:])  # shape (n,output_dims)
+        channels = [(X[masks[:,i]], Y[masks[:,i],i]) for i in range(len(y_col))]
+    else:
+        # no missing values, pass the arrays on without masking
+        channels = [(X, Y[:,i]) for i in range(len(y_col))]
+
+    if len(y_col) == 1:
+        return Data(channels[0][0], channels[0][1], name=name[0], x_labels=x_labels, y_label=y_labels[0])
 
     dataset = DataSet()
     for i in range(len(y_col)):
-        channel = df[x_col + [y_col[i]]].dropna()
-
         dataset.append(Data(
-            channel[x_col].values,
-            channel[y_col[i]].values,
+            channels[i][0],
+            channels[i][1],
             name=name[i],
             x_labels=x_labels,
-            y_label=str(y_col[i]),
+            y_label=y_labels[i],
         ))
-    if dataset.get_output_dims() == 1:
-        return dataset[0]
     return dataset
 
 ################################################################
@@ -135,6 +171,7 @@ class DataSet:
     """
     def __init__(self, *args, names=None):
         self.channels = []
+        self._name_index = {}
         if len(args) == 2 and (isinstance(args[1], np.ndarray) or isinstance(args[1], list) and all(isinstance(item, np.ndarray) for item in args[1])):
             if names is None or isinstance(names, str):
                 names = [names]
@@ -151,6 +188,12 @@ class DataSet:
         for arg in args:
             self.append(arg)
 
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if '_name_index' not in state:
+            # datasets pickled before the name index was added
+            self._build_name_index()
+
     def __iter__(self):
         return self.channels.__iter__()
 
@@ -159,7 +202,7 @@ class DataSet:
 
     def __getitem__(self, key):
         if isinstance(key, str):
-            return self.channels[self.get_names().index(key)]
+            return self.channels[self._get_name_index(key)]
         return self.channels[key]
 
     def __setitem__(self, key, arg):
@@ -169,6 +212,7 @@ class DataSet:
             self.channels[key] = arg[0]
         else:
             raise ValueError("must set a data type of Data or a DataSet with a single channel")
+        self._build_name_index()
 
     def __str__(self):
         return self.__repr__()
@@ -190,32 +234,59 @@ class DataSet:
             >>> dataset.append(mogptk.LoadFunction(lambda x: np.sin(5*x[:,0]), n=200, start=0.0, end=4.0, name='A'))
         """
         if isinstance(arg, Data):
-            self.channels.append(arg)
+            channels = [arg]
         elif isinstance(arg, DataSet):
-            for val in arg.channels:
-                self.channels.append(val)
+            channels = arg.channels
         elif isinstance(arg, list) and all(isinstance(val, Data) for val in arg):
-            for val in arg:
-                self.channels.append(val)
+            channels = arg
         elif isinstance(arg, dict) and all(isinstance(val, Data) for val in arg.values()):
+            channels = []
             for key, val in arg.items():
                 val.name = key
-                self.channels.append(val)
+                channels.append(val)
         else:
             raise ValueError("unknown data type %s in append to DataSet" % (type(arg)))
+
+        for val in channels:
+            self.channels.append(val)
+            if val.name is not None and val.name not in self._name_index:
+                self._name_index[val.name] = len(self.channels)-1
         return self
 
-    def copy(self):
+    def _build_name_index(self):
+        self._name_index = {}
+        for i, channel in enumerate(self.channels):
+            if channel.name is not None and channel.name not in self._name_index:
+                self._name_index[channel.name] = i
+
+    def _get_name_index(self, name):
+        # channels can be renamed after being added, rebuild the index when it is out of date
+        i = self._name_index.get(name)
+        if i is None or len(self.channels) <= i or self.channels[i].name != name:
+            self._build_name_index()
+            i = self._name_index.get(name)
+            if i is None:
+                raise ValueError("channel '%s' does not exist in DataSet" % (name,))
+        return i
+
+    def copy(self, deep=False):
         """
-        Make a deep copy of `DataSet`.
+        Make a copy of `DataSet`. By default the channels share their underlying X and Y arrays with the original (see `Data.view()`), which is cheap and safe since transforming, filtering, or removing observations only affects the copy.
+
+        Args:
+            deep (boolean): Make a deep copy of all data instead.
 
         Returns:
             mogptk.dataset.DataSet
 
         Examples:
             >>> other = dataset.copy()
+
+            >>> other = dataset.copy(deep=True)
         """
-        return copy.deepcopy(self)
+        if deep:
+            return copy.deepcopy(self)
+        return DataSet([channel.view() for channel in self.channels])
 
     def rescale_x(self, upper=1000.0):
         """
@@ -318,7 +389,7 @@ class DataSet:
             >>> dataset.get_names()
             ['A', 'B', 'C']
         """
-        return [channel.get_name() for i, channel in enumerate(self.channels)]
+        return [channel.name for channel in self.channels]
 
     def get(self, index):
         """
@@ -337,10 +408,8 @@ class DataSet:
             if index < len(self.channels):
                 return self.channels[index]
         elif isinstance(index, str):
-            for channel in self.channels:
-                if channel.name == index:
-                    return channel
-        raise ValueError("channel '%d' does not exist in DataSet" % (index))
+            return self.channels[self._get_name_index(index)]
+        raise ValueError("channel '%s' does not exist in DataSet" % (index,))
     
     def get_index(self, index):
         """
@@ -359,10 +428,8 @@ class DataSet:
             if index < len(self.channels):
                 return index
         elif isinstance(index, str):
-            for channel in self.channels:
-                if channel.name == index:
-                    return index
-        raise ValueError("channel '%d' does not exist in DataSet" % (index))
+            return self._get_name_index(index)
+        raise ValueError("channel '%s' does not exist in DataSet" % (index,))
     
     def get_data(self, transformed=False):
         """
@@ -378,7 +445,8 @@ class DataSet:
         Examples:
             >>> x, y = dataset.get_data()
         """
-        return [channel.get_data(transformed=transformed)[0] for channel in self.channels], [channel.get_data(transformed=transformed)[1] for channel in self.channels]
+        data = [channel.get_data(transformed=transformed) for channel in self.channels]
+        return [x for x, _ in data], [y for _, y in data]
     
     def get_train_data(self, transformed=False):
         """
@@ -394,7 +462,8 @@ class DataSet:
         Examples:
             >>> x, y = dataset.get_train_data()
         """
-        return [channel.get_train_data(transformed=transformed)[0] for channel in self.channels], [channel.get_train_data(transformed=transformed)[1] for channel in self.channels]
+        data = [channel.get_train_data(transformed=transformed) for channel in self.channels]
+        return [x for x, _ in data], [y for _, y in data]
 
     def get_test_data(self, transformed=False):
         """
@@ -410,7 +479,8 @@ class DataSet:
         Examples:
             >>> x, y = dataset.get_test_data()
         """
-        return [channel.get_test_data(transformed=transformed)[0] for channel in self.channels], [channel.get_test_data(transformed=transformed)[1] for channel in self.channels]
+        data = [channel.get_test_data(transformed=transformed) for channel in self.channels]
+        return [x for x, _ in data], [y for _, y in data]
     
     def get_prediction_x(self):
         """
@@ -475,8 +545,8 @@ class DataSet:
             for i, channel in enumerate(self.channels):
                 channel.set_prediction_x(x[i])
         elif isinstance(x, dict):
-            for name in x:
-                self.get(name).set_prediction_x(x[name])
+            for name, channel_x in x.items():
+                self.get(name).set_prediction_x(channel_x)
         else:
             for i, channel in enumerate(self.channels):
                 channel.set_prediction_x(x)
@@ -495,32 +565,33 @@ class DataSet:
             >>> dataset.set_prediction_range([2, 3], [5, 6], [4, None], [None, 0.5])
             >>> dataset.set_prediction_range(0.0, 5.0, n=200) # the same for each channel
         """
-        if not isinstance(start, (list, dict)):
-            start = [start] * self.get_output_dims()
-        elif isinstance(start, dict):
-            start = [start[name] for name in self.get_names()]
-        if not isinstance(end, (list, dict)):
-            end = [end] * self.get_output_dims()
-        elif isinstance(end, dict):
-            end = [end[name] for name in self.get_names()]
-        if n is None:
-            n = [None] * self.get_output_dims()
-        elif not isinstance(n, (list, dict)):
-            n = [n] * self.get_output_dims()
-        elif isinstance(n, dict):
-            n = [n[name] for name in self.get_names()]
-        if step is None:
-            step = [None] * self.get_output_dims()
-        elif not isinstance(step, (list, dict)):
-            step = [step] * self.get_output_dims()
-        elif isinstance(step, dict):
-            step = [step[name] for name in self.get_names()]
-
-        if len(start) != len(self.channels) or len(end) != len(self.channels) or len(n) != len(self.channels) or len(step) != len(self.channels):
+        C = len(self.channels)
+        if isinstance(start, dict) or isinstance(end, dict) or isinstance(n, dict) or isinstance(step, dict):
+            names = self.get_names()
+            if isinstance(start, dict):
+                start = [start[name] for name in names]
+            if isinstance(end, dict):
+                end = [end[name] for name in names]
+            if isinstance(n, dict):
+                n = [n[name] for name in names]
+            if isinstance(step, dict):
+                step = [step[name] for name in names]
+
+        # scalars are passed to each channel as is instead of being broadcast to lists
+        start_is_list = isinstance(start, list)
+        end_is_list = isinstance(end, list)
+        n_is_list = isinstance(n, list)
+        step_is_list = isinstance(step, list)
+        if start_is_list and len(start) != C or end_is_list and len(end) != C or n_is_list and len(n) != C or step_is_list and len(step) != C:
             raise ValueError("start, end, n, and/or step must be lists of shape (output_dims,n)")
 
         for i, channel in enumerate(self.channels):
-            channel.set_prediction_range(start[i], end[i], n[i], step[i])
+            channel.set_prediction_range(
+                start[i] if start_is_list else start,
+                end[i] if end_is_list else end,
+                n[i] if n_is_list else n,
+                step[i] if step_is_list else step,
+            )
 
     def clear_predictions(self):
         """
@@ -641,21 +712,23 @@ class DataSet:
         Examples:
             >>> fig, axes = dataset.plot(title='Title')
         """
+        for channel in self.channels:
+            channel._check_plot_input_dims()
+
+        C = len(self.channels)
         if figsize is None:
-            figsize = (12, 3.0 * len(self.channels))
+            figsize = (12, 3.0 * C)
 
         h = figsize[1]
-        fig, axes = plt.subplots(self.get_output_dims(), 1, figsize=figsize, squeeze=False, constrained_layout=True)
+        fig, axes = plt.subplots(C, 1, figsize=figsize, squeeze=False, constrained_layout=True)
 
+        # merge the legend handles of all channels without drawing a legend per channel
         legends = {}
-        for channel in range(self.get_output_dims()):
-            self.channels[channel].plot(pred=pred, ax=axes[channel,0], transformed=transformed)
-            l = axes[channel,0].get_legend()
-            for text, handle in zip(l.texts, l.legendHandles):
-                if text.get_text() == "Training Points":
-                    handle = plt.Line2D([0], [0], ls='-', color='k', marker='.', ms=10, label='Training Points')
-                legends[text.get_text()] = handle
-            l.remove()
+        for channel in range(C):
+            for handle in self.channels[channel]._plot(axes[channel,0], pred=pred, transformed=transformed):
+                legends[handle.get_label()] = handle
+        if "Training Points" in legends:
+            legends["Training Points"] = plt.Line2D([0], [0], ls='-', color='k', marker='.', ms=10, label='Training Points')
 
         legend_rows = (len(legends)-1)/5 + 1
         if title is not None:
@@ -684,20 +757,40 @@ class DataSet:
         Examples:
             >>> fig, axes = dataset.plot_spectrum(title='Title', method='bnse')
         """
+        C = len(self.channels)
         if not isinstance(method, list):
-            method = [method] * len(self.channels)
+            method = [method] * C
         if not isinstance(per, list):
-            per = [per] * len(self.channels)
+            per = [per] * C
         if not isinstance(maxfreq, list):
-            maxfreq = [maxfreq] * len(self.channels)
+            maxfreq = [maxfreq] * C
 
         if figsize is None:
-            figsize = (12, 3.0 * len(self.channels))
+            figsize = (12, 3.0 * C)
 
-        fig, axes = plt.subplots(self.get_output_dims(), 1, figsize=figsize, squeeze=False, constrained_layout=True)
+        fig, axes = plt.subplots(C, 1, figsize=figsize, squeeze=False, constrained_layout=True)
         if title != None:
             fig.suptitle(title, fontsize=18)
 
-        for channel in range(self.get_output_dims()):
+        for channel in range(C):
             ax = self.channels[channel].plot_spectrum(method=method[channel], ax=axes[channel,0], per=per[channel], maxfreq=maxfreq[channel], transformed=transformed)
         return fig, axes
+
+def _get_column_position(df, col):
+    # get_loc returns a slice or boolean mask instead of a position when the column name is not unique
+    pos = df.columns.get_loc(col)
+    if not isinstance(pos, (int, np.integer)):
+        raise ValueError("column '%s' is ambiguous, the dataframe has multiple columns with that name" % (col,))
+    return pos
+
+def _normalize_cols(cols, name):
+    # return columns as a list and whether they are indices (True) or names (False)
+    if not isinstance(cols, list):
+        cols = [cols]
+    if any(isinstance(item, (bool, np.bool_)) for item in cols):
+        raise ValueError("%s must be integer, string or list of integers or strings" % (name,))
+    if 0 < len(cols) and all(isinstance(item, (int, np.integer)) for item in cols):
+        return [int(item) for item in cols], True
+    if 0 < len(cols) and all(isinstance(item, str) for item in cols):
+        return [str(item) for item in cols], False
+    raise ValueError("%s must be integer, string or list of integers or strings" % (name,))
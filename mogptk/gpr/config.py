@@ -7,6 +7,7 @@ class Config:
     else:
         device = torch.device('cpu')
     positive_minimum = 1e-8
+    cpu_cholesky_threshold = 512
 config = Config()
 
 def use_single_precision():
@@ -63,3 +64,9 @@ def set_positive_minimum(val):
     Set the positive minimum for kernel parameters. This is usually slightly larger than zero to avoid numerical instabilities. Default is at 1e-8.
     """
     config.positive_minimum = val
+
+def set_cpu_cholesky_threshold(n):
+    """
+    Set the kernel matrix size below which the Cholesky decomposition is calculated on the CPU even when using the GPU. For small matrices the GPU kernel launch and synchronization overhead is larger than the decomposition itself. Set to zero to always use the GPU. Default is at 512.
+    """
+    config.cpu_cholesky_threshold = n
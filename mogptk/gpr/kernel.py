@@ -109,7 +109,11 @@ class AddKernel(Kernel):
         return self.kernels[key]
 
     def K(self, X1, X2=None):
-        return torch.stack([kernel(X1,X2) for kernel in self.kernels], dim=2).sum(dim=2)
+        # accumulate instead of stacking to avoid allocating an NxMxQ tensor
+        K = self.kernels[0](X1,X2)
+        for kernel in self.kernels[1:]:
+            K = K + kernel(X1,X2)
+        return K
 
 class MulKernel(Kernel):
     def __init__(self, *kernels, name="Mul"):
@@ -120,7 +124,11 @@ class MulKernel(Kernel):
         return self.kernels[key]
 
     def K(self, X1, X2=None):
-        return torch.stack([kernel(X1,X2) for kernel in self.kernels], dim=2).prod(dim=2)
+        # accumulate instead of stacking to avoid allocating an NxMxQ tensor
+        K = self.kernels[0](X1,X2)
+        for kernel in self.kernels[1:]:
+            K = K * kernel(X1,X2)
+        return K
 
 class MixtureKernel(AddKernel):
     def __init__(self, kernel, Q, name="Mixture"):
@@ -98,6 +98,13 @@ class Model:
             for v in obj.__dict__.values():
                 self._register_parameters(v, (name+"." if name is not None else "")+obj.name)
 
+    def _parameters_key(self):
+        # identify the current parameter values to invalidate caches, parameters are replaced by assign() or updated in place by the optimizer and both change the key
+        # the parameter tensors are returned as well, callers must hold on to them so that their ids in the key are not reused
+        refs = [p.unconstrained for p in self._params]
+        key = [(id(p), p._version) for p in refs]
+        return key, refs
+
     def zero_grad(self):
         for p in self._params:
             p = p.unconstrained
@@ -159,6 +166,8 @@ class Model:
 
     def _cholesky(self, K):
         try:
+            if K.device.type == 'cuda' and K.shape[0] < config.cpu_cholesky_threshold:
+                return torch.cholesky(K.cpu()).to(K.device)
             return torch.cholesky(K)
         except RuntimeError as e:
             print("ERROR:", e.args[0], file=sys.__stdout__)
@@ -180,7 +189,8 @@ class Model:
     def loss(self):
         self.zero_grad()
         loss = -self.log_marginal_likelihood() - self.log_prior()
-        loss.backward()
+        if loss.requires_grad:
+            loss.backward()
         return loss
 
     def K(self, X1, X2=None):
@@ -214,8 +224,20 @@ class GPR(Model):
 
         self.noise = Parameter(noise, name="noise", lower=config.positive_minimum)
         self._register_parameters(self.noise)
+        self._posterior_cache = None
 
-    def log_marginal_likelihood(self):
+    def __getstate__(self):
+        # the posterior cache holds NxN matrices, do not save it along with the model
+        state = self.__dict__.copy()
+        state['_posterior_cache'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_posterior_cache', None)  # models saved before the cache was added
+
+    def _factorize(self):
+        # return the Cholesky factor of the training kernel matrix and the training outputs minus the mean
         K = self.kernel(self.X) + self.noise()*torch.eye(self.X.shape[0], device=config.device, dtype=config.dtype)  # NxN
         L = self._cholesky(K)  # NxN
 
@@ -223,33 +245,46 @@ class GPR(Model):
             y = self.y - self.mean(self.X).reshape(-1,1)  # Nx1
         else:
             y = self.y  # Nx1
+        return L, y
+
+    def log_marginal_likelihood(self):
+        L, y = self._factorize()  # NxN and Nx1
 
         p = -0.5*y.T.mm(torch.cholesky_solve(y,L)).squeeze()
         p -= L.diagonal().log().sum()
         p -= self.log_marginal_likelihood_constant
         return p#/self.X.shape[0]  # dividing by the number of data points normalizes the learning rate
 
+    def _posterior(self):
+        # the Cholesky factor of the training data and K^-1 y only change when a parameter is assigned or optimized, so reuse them between predictions
+        key, refs = self._parameters_key()
+        if self._posterior_cache is not None and self._posterior_cache[0] == key:
+            return self._posterior_cache[2], self._posterior_cache[3]
+
+        L, y = self._factorize()  # NxN and Nx1
+        alpha = torch.cholesky_solve(y,L)  # Nx1
+        self._posterior_cache = (key, refs, L, alpha)
+        return L, alpha
+
     def predict(self, Z, full=False, tensor=False):
         with torch.no_grad():
             Z = self._check_input(Z)  # MxD
 
-            K = self.kernel(self.X) + self.noise()*torch.eye(self.X.shape[0], device=config.device, dtype=config.dtype)  # NxN
+            L, alpha = self._posterior()  # NxN and Nx1
             Ks = self.kernel(self.X,Z)  # NxM
             Kss = self.kernel(Z) + self.noise()*torch.eye(Z.shape[0], device=config.device, dtype=config.dtype)  # MxM
 
-            L = self._cholesky(K)  # NxN
             v = torch.triangular_solve(Ks,L,upper=False)[0]  # NxM
 
+            mu = Ks.T.mm(alpha)  # Mx1
             if self.mean is not None:
-                y = self.y - self.mean(self.X).reshape(-1,1)  # Nx1
-                mu = Ks.T.mm(torch.cholesky_solve(y,L))  # Mx1
-                mu += self.mean(Z).reshape(-1,1)         # Mx1
-            else:
-                mu = Ks.T.mm(torch.cholesky_solve(self.y,L))  # Mx1
+                mu += self.mean(Z).reshape(-1,1)  # Mx1
 
-            var = Kss - v.T.mm(v)  # MxM
-            if not full:
-                var = var.diag().reshape(-1,1)  # Mx1
+            if full:
+                var = Kss - v.T.mm(v)  # MxM
+            else:
+                # only the diagonal of v.T.mm(v) is needed, which avoids an O(N*M^2) product
+                var = (Kss.diag() - v.pow(2).sum(dim=0)).reshape(-1,1)  # Mx1
             if tensor:
                 return mu, var
             else:
@@ -46,22 +46,28 @@ class MultiOutputSpectralKernel(MultiOutputKernel):
     def Ksub(self, i, j, X1, X2=None):
         # X has shape (data_points,input_dims)
         tau = self.distance(X1,X2)  # NxMxD
+
+        # evaluate the constrained parameters only once
+        magnitude = self.magnitude()  # M
+        mean = self.mean()  # MxD
+        variance = self.variance()  # MxD
         if i == j:
-            variance = self.variance()[i]
-            alpha = self.magnitude()[i]**2 * self.twopi * variance.prod().sqrt()  # scalar
-            exp = torch.exp(-0.5*torch.tensordot(tau**2, variance, dims=1))  # NxM
-            cos = torch.cos(2.0*np.pi * torch.tensordot(tau, self.mean()[i], dims=1))  # NxM
+            alpha = magnitude[i]**2 * self.twopi * variance[i].prod().sqrt()  # scalar
+            exp = torch.exp(-0.5*torch.tensordot(tau**2, variance[i], dims=1))  # NxM
+            cos = torch.cos(2.0*np.pi * torch.tensordot(tau, mean[i], dims=1))  # NxM
             return alpha * exp * cos
         else:
-            inv_variances = 1.0/(self.variance()[i] + self.variance()[j])  # D
+            inv_variances = 1.0/(variance[i] + variance[j])  # D
 
-            diff_mean = self.mean()[i] - self.mean()[j]  # D
-            magnitude = self.magnitude()[i]*self.magnitude()[j]*torch.exp(-np.pi**2 * diff_mean.dot(inv_variances*diff_mean))  # scalar
+            diff_mean = mean[i] - mean[j]  # D
+            magnitude = magnitude[i]*magnitude[j]*torch.exp(-np.pi**2 * diff_mean.dot(inv_variances*diff_mean))  # scalar
 
-            mean = inv_variances * (self.variance()[i]*self.mean()[j] + self.variance()[j]*self.mean()[i])  # D
-            variance = 2.0 * self.variance()[i] * inv_variances * self.variance()[j]  # D
-            delay = self.delay()[i] - self.delay()[j]  # D
-            phase = self.phase()[i] - self.phase()[j]  # scalar
+            mean = inv_variances * (variance[i]*mean[j] + variance[j]*mean[i])  # D
+            variance = 2.0 * variance[i] * inv_variances * variance[j]  # D
+            delay = self.delay()  # MxD
+            delay = delay[i] - delay[j]  # D
+            phase = self.phase()  # M
+            phase = phase[i] - phase[j]  # scalar
 
             alpha = magnitude * self.twopi * variance.prod().sqrt()  # scalar
             exp = torch.exp(-0.5 * torch.tensordot((tau+delay)**2, variance, dims=1))  # NxM
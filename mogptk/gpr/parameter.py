@@ -46,11 +46,19 @@ class Parameter:
         self.lower = None
         self.upper = None
         self.prior = prior
-        self.trainable = trainable
         self.transform = None
         self.unconstrained = None
+        self.trainable = trainable
         self.assign(value, lower=lower, upper=upper)
 
+    def __setstate__(self, state):
+        # parameters saved before trainable became a property store it as a plain attribute
+        if 'trainable' in state:
+            state['_trainable'] = state.pop('trainable')
+            if state['unconstrained'] is not None:
+                state['unconstrained'].requires_grad_(state['_trainable'])
+        self.__dict__.update(state)
+
     def __repr__(self):
         if self.name is None:
             return '{}'.format(self.constrained.tolist())
@@ -59,6 +67,17 @@ class Parameter:
     def __call__(self):
         return self.constrained
 
+    @property
+    def trainable(self):
+        return self._trainable
+
+    @trainable.setter
+    def trainable(self, trainable):
+        # fixed parameters are left out of the autograd graph so that no gradients are calculated for them
+        self._trainable = trainable
+        if self.unconstrained is not None:
+            self.unconstrained.requires_grad_(trainable)
+
     @property
     def constrained(self):
         if self.transform is not None:
@@ -130,7 +149,7 @@ class Parameter:
             if upper is not None:
                 value = torch.where(upper < value, upper * torch.ones_like(value), value)
             value = transform.inverse(value)
-        value.requires_grad = True
+        value.requires_grad = trainable
 
         self.name = name
         self.prior = prior
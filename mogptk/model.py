@@ -11,7 +11,7 @@ from mpl_toolkits.axes_grid1 import make_axes_locatable
 
 from .serie import Serie
 from .dataset import DataSet
-from .gpr import GPR, CholeskyException, Kernel, MultiOutputKernel, IndependentMultiOutputKernel
+from .gpr import GPR, CholeskyException, Kernel, MultiOutputKernel, IndependentMultiOutputKernel, config
 from .errors import mean_absolute_error, mean_absolute_percentage_error, symmetric_mean_absolute_percentage_error, mean_squared_error, root_mean_squared_error
 
 logger = logging.getLogger('mogptk')
@@ -69,6 +69,7 @@ class Model:
         self.name = name
         self.dataset = dataset
         self.kernel = kernel
+        self._prediction_cache = None
 
         X = [np.array([x[channel.mask] for x in channel.X]).T for channel in self.dataset.channels]
         Y = [np.array(channel.Y[channel.mask]) for channel in self.dataset.channels]
@@ -78,6 +79,16 @@ class Model:
         if issubclass(type(kernel), MultiOutputKernel) and issubclass(type(model), Exact):
             self.model.noise.assign(0.0, lower=0.0, trainable=False)  # handled by MultiOutputKernel
 
+    def __getstate__(self):
+        # caches are rebuilt on demand, do not save them along with the model
+        state = self.__dict__.copy()
+        state['_prediction_cache'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_prediction_cache', None)  # models saved before the cache was added
+
     ################################################################
 
     def print_parameters(self):
@@ -158,6 +169,9 @@ class Model:
         """
         X, Y_true = self.dataset.get_test_data()
         x, y_true  = self._to_kernel_format(X, Y_true)
+        return self._error(x, y_true, method)
+
+    def _error(self, x, y_true, method):
         y_pred, _ = self.model.predict(x)
         if method.lower() == 'mae':
             return mean_absolute_error(y_true, y_pred)
@@ -211,6 +225,11 @@ class Model:
         elif method.lower() == 'adagrad':
             method = 'AdaGrad'
 
+        if error is not None:
+            # the test data does not change while training, so convert it only once
+            X_test, Y_test = self.dataset.get_test_data()
+            x_test, y_test = self._to_kernel_format(X_test, Y_test)
+
         if verbose:
             training_points = sum([len(channel.get_train_data()[0]) for channel in self.dataset])
             parameters = sum([int(np.prod(param.shape)) for param in self.model.parameters()])
@@ -223,7 +242,7 @@ class Model:
             print('‣ Parameters: {}'.format(parameters))
             print('‣ Initial loss: {:.3g}'.format(self.loss()))
             if error is not None:
-                print('‣ Initial error: {:.3g}'.format(self.error(error)))
+                print('‣ Initial error: {:.3g}'.format(self._error(x_test, y_test, error)))
             inital_time = time.time()
 
         losses = np.empty((iters+1,))
@@ -240,7 +259,7 @@ class Model:
                 i = int(optimizer.state_dict()['state'][0]['func_evals'])
                 losses[i] = self.loss()
                 if error is not None:
-                    errors[i] = self.error(error)
+                    errors[i] = self._error(x_test, y_test, error)
                     if i % (kwargs['max_iter']/100) == 0:
                         sys.__stdout__.write("% 5d/%d  loss=%10g  error=%10g\n" % (i, kwargs['max_iter'], losses[i], errors[i]))
                 elif i % (kwargs['max_iter']/100) == 0:
@@ -263,7 +282,7 @@ class Model:
             for i in range(iters):
                 losses[i] = self.loss()
                 if error is not None:
-                    errors[i] = self.error(error)
+                    errors[i] = self._error(x_test, y_test, error)
                     if i % (iters/100) == 0:
                         sys.__stdout__.write("% 5d/%d  loss=%10g  error=%10g\n" % (i, iters, losses[i], errors[i]))
                 elif i % (iters/100) == 0:
@@ -271,7 +290,7 @@ class Model:
                 optimizer.step()
         losses[iters] = self.loss()
         if error is not None:
-            errors[iters] = self.error(error)
+            errors[iters] = self._error(x_test, y_test, error)
             sys.__stdout__.write("% 5d/%d  loss=%10g  error=%10g\n" % (iters, iters, losses[iters], errors[iters]))
         else:
             sys.__stdout__.write("% 5d/%d  loss=%10g\n" % (iters, iters, losses[iters]))
@@ -299,10 +318,15 @@ class Model:
 
     # TODO: add get_prediction
 
-    def _to_kernel_format(self, X, Y=None):
+    def _to_kernel_format(self, X, Y=None, dtype=None):
         """
         Return the data vectors in the format used by the kernels. If Y is not passed, than only X data is returned.
 
+        Args:
+            X (list, dict, numpy.ndarray): X data of shape (n,input_dims) per channel.
+            Y (list, numpy.ndarray): Y data of shape (n,) per channel.
+            dtype (numpy.dtype): Data type of the returned arrays, by default it matches the precision used for the tensors (see `use_single_precision()`).
+
         Returns:
             numpy.ndarray: X data of shape (n,2) where X[:,0] contains the channel indices and X[:,1] the X values.
             numpy.ndarray: Y data.
@@ -319,27 +343,37 @@ class Model:
             raise ValueError("X must be a list, dict or numpy.ndarray")
         if len(X) != len(self.dataset.channels):
             raise ValueError("X must be a list of shape (n,input_dims) for each channel")
+        if dtype is None:
+            dtype = np.float32 if config.dtype == torch.float32 else np.float64
+
         X_orig = X
         X = X.copy()
+        input_dims = self.dataset.get_input_dims()
+        if any(input_dim != input_dims[0] for input_dim in input_dims):
+            raise ValueError("all channels must have the same number of input dimensions")
         for j, channel_x in enumerate(X):
-            input_dims = self.dataset.get_input_dims()[j]
             if isinstance(channel_x, list):
                 channel_x = np.array(channel_x)
             elif not isinstance(channel_x, np.ndarray):
                 raise ValueError("X must be a list of lists or numpy.ndarrays")
             if channel_x.ndim == 1:
                 channel_x = channel_x.reshape(-1, 1)
-            if channel_x.ndim != 2 or channel_x.shape[1] != input_dims:
+            if channel_x.ndim != 2 or channel_x.shape[1] != input_dims[j]:
                 raise ValueError("X must be a list of shape (n,input_dims) for each channel")
-            X[j] = np.array([self.dataset[j].X[i].transform(channel_x[:,i]) for i in range(input_dims)]).T
+            X[j] = channel_x
 
-        chan = [i * np.ones(len(X[i])) for i in range(len(X))]
-        chan = np.concatenate(chan).reshape(-1, 1)
         if len(X) == 0:
             x = np.array([])
         else:
-            x = np.concatenate(X, axis=0)
-            x = np.concatenate([chan, x], axis=1)
+            # write channel indices and transformed X values directly into the columns of the output array
+            lens = [channel_x.shape[0] for channel_x in X]
+            x = np.empty((sum(lens), input_dims[0]+1), dtype=dtype)
+            x[:,0] = np.repeat(np.arange(len(X)), lens)
+            offset = 0
+            for j, channel_x in enumerate(X):
+                for i in range(input_dims[j]):
+                    x[offset:offset+lens[j],i+1] = self.dataset[j].X[i].transform(channel_x[:,i])
+                offset += lens[j]
         if Y is None:
             return x, X_orig
 
@@ -349,19 +383,44 @@ class Model:
             raise ValueError("Y must be a list or numpy.ndarray")
         if len(Y) != len(self.dataset.channels):
             raise ValueError("Y must be a list of shape (n,) for each channel")
-        Y = Y.copy()
         for j, channel_y in enumerate(Y):
             if channel_y.ndim != 1:
                 raise ValueError("Y must be a list of shape (n,) for each channel")
             if channel_y.shape[0] != X[j].shape[0]:
                 raise ValueError("Y must have the same number of data points per channel as X")
-            Y[j] = self.dataset[j].Y.transform(channel_y, x=X_orig[j])
         if len(Y) == 0:
             y = np.array([])
         else:
-            y = np.concatenate(Y, axis=0).reshape(-1, 1)
+            # write transformed Y values directly into the output array
+            y = np.empty((x.shape[0], 1), dtype=dtype)
+            offset = 0
+            for j, channel_y in enumerate(Y):
+                y[offset:offset+lens[j],0] = self.dataset[j].Y.transform(channel_y, x=X_orig[j])
+                offset += lens[j]
         return x, y
 
+    def _to_kernel_prediction(self, dtype=None):
+        """
+        Return the prediction range of the data set in the format used by the kernels. The result is reused as long as the prediction range and the X transformations of the channels do not change.
+
+        Args:
+            dtype (numpy.dtype): Data type of the returned array, by default it matches the precision used for the tensors (see `use_single_precision()`).
+
+        Returns:
+            numpy.ndarray: X data of shape (n,2) where X[:,0] contains the channel indices and X[:,1] the X values.
+            numpy.ndarray: Original but normalized X data.
+        """
+        if dtype is None:
+            dtype = np.float32 if config.dtype == torch.float32 else np.float64
+
+        # the cache holds references to the prediction ranges and X series so that their ids cannot be reused
+        refs = [(channel.X_pred, tuple(channel.X)) for channel in self.dataset]
+        key = [np.dtype(dtype)] + [(id(X_pred), [(id(x), len(x.transformers)) for x in X]) for X_pred, X in refs]
+        if self._prediction_cache is None or self._prediction_cache[0] != key:
+            x, X = self._to_kernel_format(self.dataset.get_prediction_x(), dtype=dtype)
+            self._prediction_cache = (key, refs, x, X)
+        return self._prediction_cache[2], self._prediction_cache[3]
+
     def predict(self, X=None, sigma=2.0, transformed=False):
         """
         Predict using the prediction range of the data set and save the prediction in that data set. Otherwise, if `X` is passed, use that as the prediction range and return the prediction instead of saving it.
@@ -383,19 +442,18 @@ class Model:
         if save and transformed:
             raise ValueError('must pass an X range explicitly in order to return transformed data')
         if save:
-            X = self.dataset.get_prediction_x()
-        x, X = self._to_kernel_format(X)
+            x, X = self._to_kernel_prediction()
+        else:
+            x, X = self._to_kernel_format(X)
 
         mu, var = self.model.predict(x)
+        mu = mu.reshape(-1)
+        var = var.reshape(-1)
 
-        i = 0
-        Mu = []
-        Var = []
-        for j in range(self.dataset.get_output_dims()):
-            N = X[j].shape[0]
-            Mu.append(np.squeeze(mu[i:i+N]))
-            Var.append(np.squeeze(var[i:i+N]))
-            i += N
+        # split the predictions per channel as views into the flat arrays
+        offsets = np.concatenate(([0], np.cumsum([len(channel_x) for channel_x in X])))
+        Mu = [mu[offsets[j]:offsets[j+1]] for j in range(len(X))]
+        Var = [var[offsets[j]:offsets[j+1]] for j in range(len(X))]
 
         if save:
             for j in range(self.dataset.get_output_dims()):
@@ -76,8 +76,6 @@ class CONV(Model):
             sm_plot (bool): Show the PSD of the kernel after fitting SM.
         """
 
-        output_dims = self.dataset.get_output_dims()
-
         # TODO: doesn't work well
         if not method.lower() in ['bnse', 'ls', 'sm']:
             raise ValueError("valid methods of estimation are BNSE, LS, and SM")
@@ -93,22 +91,17 @@ class CONV(Model):
             return
 
         # input_dims must be the same for all channels (restriction of MOSM)
-        constant = np.empty((output_dims, self.Q))
-        for q in range(self.Q):
-            constant[:,q] = np.array([amplitude[q,:] for amplitude in amplitudes]).mean(axis=1)
-            self.model.kernel[q].variance.assign([variance[q,:] * 10.0 for variance in variances])
+        amplitudes = np.array(amplitudes)  # MxQxD
+        variances = np.array(variances) * 10.0  # MxQxD
+        constant = amplitudes.mean(axis=2)  # MxQ
 
-        for i, channel in enumerate(self.dataset):
-            _, y = channel.get_train_data(transformed=True)
-            if 0.0 < constant[i,:].sum():
-                constant[i,:] = constant[i,:] / constant[i,:].sum() * y.var()
+        y_var = np.array([channel.get_train_data(transformed=True)[1].var() for channel in self.dataset])
+        constant_sum = constant.sum(axis=1)
+        positive = 0.0 < constant_sum
+        constant[positive,:] = constant[positive,:] / constant_sum[positive,None] * y_var[positive,None]
+        noise = y_var / 30.0
 
         for q in range(self.Q):
+            self.model.kernel[q].variance.assign(variances[:,q,:])
             self.model.kernel[q].weight.assign(constant[:,q])
-
-        noise = np.empty((output_dims,))
-        for i, channel in enumerate(self.dataset):
-            _, y = channel.get_train_data(transformed=True)
-            noise[i] = y.var() / 30.0
-        for q in range(self.Q):
             self.model.kernel[q].noise.assign(noise)
@@ -1,3 +1,4 @@
+import torch
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -56,6 +57,16 @@ class MOSM(Model):
         self.Q = Q
         for q in range(Q):
             self.model.kernel[q].mean.assign(upper=nyquist)
+        self._cross_params_cache = None
+
+    def __getstate__(self):
+        state = super(MOSM, self).__getstate__()
+        state['_cross_params_cache'] = None
+        return state
+
+    def __setstate__(self, state):
+        super(MOSM, self).__setstate__(state)
+        self.__dict__.setdefault('_cross_params_cache', None)  # models saved before the cache was added
 
     def init_parameters(self, method='BNSE', sm_init='BNSE', sm_method='Adam', sm_iters=100, sm_params={}, sm_plot=False):
         """
@@ -77,7 +88,6 @@ class MOSM(Model):
         """
 
         input_dims = self.dataset.get_input_dims()
-        output_dims = self.dataset.get_output_dims()
 
         if not method.lower() in ['bnse', 'ls', 'sm']:
             raise ValueError("valid methods of estimation are BNSE, LS, and SM")
@@ -92,45 +102,32 @@ class MOSM(Model):
             logger.warning('{} could not find peaks for MOSM'.format(method))
             return
 
-        magnitude = np.zeros((output_dims, self.Q))
-        for q in range(self.Q):
-            mean = np.zeros((output_dims,input_dims[0]))
-            variance = np.zeros((output_dims,input_dims[0]))
-            for j in range(output_dims):
-                if q < amplitudes[j].shape[0]:
-                    magnitude[j,q] = amplitudes[j][q,:].mean()
-                    mean[j,:] = means[j][q,:]
-                    # maybe will have problems with higher input dimensions
-                    variance[j,:] = variances[j][q,:] * (4 + 20 * (max(input_dims) - 1)) # 20
-            self.model.kernel[q].mean.assign(mean)
-            self.model.kernel[q].variance.assign(variance)
+        amplitudes = np.array(amplitudes)  # MxQxD
+        means = np.array(means)  # MxQxD
+        variances = np.array(variances) * (4 + 20 * (max(input_dims) - 1))  # MxQxD, maybe will have problems with higher input dimensions
+        magnitude = amplitudes.mean(axis=2)  # MxQ
 
         # normalize proportional to channels variances
-        for j, channel in enumerate(self.dataset):
-            _, y = channel.get_train_data(transformed=True)
-            if 0.0 < magnitude[j,:].sum():
-                magnitude[j,:] = np.sqrt(magnitude[j,:] / magnitude[j,:].sum() * y.var()) * 2
-        
-        for q in range(self.Q):
-            self.model.kernel[q].magnitude.assign(magnitude[:,q])
+        y_var = np.array([channel.get_train_data(transformed=True)[1].var() for channel in self.dataset])
+        magnitude_sum = magnitude.sum(axis=1)
+        positive = 0.0 < magnitude_sum
+        magnitude[positive,:] = np.sqrt(magnitude[positive,:] / magnitude_sum[positive,None] * y_var[positive,None]) * 2
+        noise = y_var / 30.0
 
-        noise = np.empty((output_dims,))
-        for j, channel in enumerate(self.dataset):
-            _, y = channel.get_train_data(transformed=True)
-            noise[j] = y.var() / 30.0
         for q in range(self.Q):
+            self.model.kernel[q].magnitude.assign(magnitude[:,q])
+            self.model.kernel[q].mean.assign(means[:,q,:])
+            self.model.kernel[q].variance.assign(variances[:,q,:])
             self.model.kernel[q].noise.assign(noise)
 
     def check(self):
         """
         Check validity of model and parameters.
         """
-        for j in range(self.dataset.get_output_dims()):
-            for q in range(self.Q):
-                mean = self.model.kernel[q].mean.numpy()[j,:]
-                var = self.model.kernel[q].variance.numpy()[j,:]
-                if np.linalg.norm(mean) < np.linalg.norm(var):
-                    print("‣ MOSM approaches RBF kernel for q=%d in channel='%s'" % (q, self.dataset[j].name))
+        mean = np.linalg.norm(self._get_param_across('mean'), axis=2)  # QxM
+        var = np.linalg.norm(self._get_param_across('variance'), axis=2)  # QxM
+        for j, q in zip(*np.nonzero((mean < var).T)):
+            print("‣ MOSM approaches RBF kernel for q=%d in channel='%s'" % (q, self.dataset[j].name))
 
     def plot_spectrum(self, title=None):
         """
@@ -139,9 +136,9 @@ class MOSM(Model):
         names = self.dataset.get_names()
         nyquist = self.dataset.get_nyquist_estimation()
 
-        means = np.array([self.model.kernel[q].mean.numpy() for q in range(self.Q)])
-        scales = np.array([self.model.kernel[q].variance.numpy() for q in range(self.Q)])
-        weights = np.array([self.model.kernel[q].magnitude.numpy() for q in range(self.Q)])**2
+        means = self._get_param_across('mean')
+        scales = self._get_param_across('variance')
+        weights = self._get_param_across('magnitude')**2
 
         return plot_spectrum(means, scales, weights=weights, nyquist=nyquist, titles=names, title=title)
 
@@ -154,7 +151,7 @@ class MOSM(Model):
             raise RuntimeError("not implemented for multiple input dimensions")
 
         cross_params = self._get_cross_parameters()
-        output_dims = self.dataset.get_output_dims()
+        output_dims = cross_params['magnitude'].shape[0]
 
         h = figsize[1]
         fig, axes = plt.subplots(output_dims, output_dims, figsize=figsize, squeeze=False, constrained_layout=True)
@@ -197,31 +194,43 @@ class MOSM(Model):
         w_high = (mean + 2* np.sqrt(cov)).max()
         w = np.linspace(-w_high, w_high, 1000)
 
+        # evaluate all components at once
+        mean = mean[:,None]  # Qx1
+        cov = cov[:,None]  # Qx1
+        psd = np.exp(-0.5 * (w - mean)**2 / cov) + np.exp(-0.5 * (w + mean)**2 / cov)  # QxW
+        psd *= magn[:,None] * 0.5
+
         # power spectral density
         if i == j:
-            psd_total = np.zeros(len(w))
-            for q in range(self.Q):
-                psd_q = np.exp(-0.5 * (w - mean[q])**2 / cov[q])
-                psd_q += np.exp(-0.5 * (w + mean[q])**2 / cov[q])
-                psd_q *= magn[q] * 0.5
+            for psd_q in psd:
                 ax.plot(w, psd_q, ls='--', c='k')
-                psd_total += psd_q
-            ax.plot(w, psd_total, c='k')
+            ax.plot(w, psd.sum(axis=0), c='k')
         # power cross spectral density
         else:
-            psd_total = np.zeros(len(w)) + 0.j
-            for q in range(self.Q):
-                psd_q = np.exp(-0.5 * (w - mean[q])**2 / cov[q] + 1.j * (w * delay[q] + phase[q]))
-                psd_q += np.exp(-0.5 * (w + mean[q])**2 / cov[q] + 1.j * (w * delay[q] + phase[q]))
-                psd_q *= magn[q] * 0.5
+            psd = psd * np.exp(1.j * (w * delay[:,None] + phase[:,None]))
+            for psd_q in psd:
                 ax.plot(w, np.real(psd_q), ls='--', c='k')
                 ax.plot(w, np.imag(psd_q), ls='--', c='silver')
-                psd_total += psd_q
+            psd_total = psd.sum(axis=0)
             ax.plot(w, np.real(psd_total), c='k')
             ax.plot(w, np.imag(psd_total), c='silver')
         ax.set_yticks([])
         return
 
+    def _get_param_across(self, name):
+        """
+        Obtain a kernel parameter for all components.
+
+        Args:
+            name (str): Name of the parameter, such as magnitude, mean, variance, delay, or phase.
+
+        Returns:
+            numpy.ndarray: Parameter values of shape (Q,...) where the remaining dimensions are those of the parameter.
+        """
+        # stack on the device and copy to the host once instead of once per component
+        with torch.no_grad():
+            return torch.stack([getattr(self.model.kernel[q], name)() for q in range(self.Q)]).cpu().numpy()
+
     def _get_cross_parameters(self):
         """
         Obtain cross parameters from MOSM.
@@ -229,50 +238,38 @@ class MOSM(Model):
         Returns:
             cross_params(dict): Dictionary with the cross parameters: covariance, mean, magnitude, delay and phase. Each one an array of shape (output_dim,output_dim,input_dim,Q) with the cross parameters, with the exception of magnitude and phase where the cross parameters are of shape (output_dim,output_dim,Q).
 
-        This assumes the same input dimension for all channels.
+        This assumes the same input dimension for all channels. The result is reused as long as the parameters do not change.
         """
-        m = self.dataset.get_output_dims()
-        d = self.dataset.get_input_dims()[0]
-        Q = self.Q
+        key, refs = self.model._parameters_key()
+        if self._cross_params_cache is None or self._cross_params_cache[0] != key:
+            self._cross_params_cache = (key, refs, self._compute_cross_parameters())
+        return self._cross_params_cache[2]
+
+    def _compute_cross_parameters(self):
+        magnitude = self._get_param_across('magnitude')  # QxM
+        mean = self._get_param_across('mean')  # QxMxD
+        variance = self._get_param_across('variance')  # QxMxD
+        Q, m, d = mean.shape
+
+        # broadcast channel i along axis 1 and channel j along axis 2
+        mu_i = mean[:,:,None,:]
+        mu_j = mean[:,None,:,:]
+        var_i = variance[:,:,None,:]
+        var_j = variance[:,None,:,:]
+        sv = var_i + var_j  # QxMxMxD
 
         cross_params = {}
-
-        cross_params['covariance'] = np.zeros((m, m, d, Q))
-        cross_params['mean'] = np.zeros((m, m, d, Q))
-        cross_params['magnitude'] = np.zeros((m, m, Q))
-        cross_params['delay'] = np.zeros((m, m, d, Q))
-        cross_params['phase'] = np.zeros((m, m, Q))
-
-        for q in range(Q):
-            for i in range(m):
-                for j in range(m):
-                    magnitude = self.model.kernel[q].magnitude.numpy()
-                    mean = self.model.kernel[q].mean.numpy()
-                    variance = self.model.kernel[q].variance.numpy()
-
-                    w_i = magnitude[i]
-                    w_j = magnitude[j]
-                    mu_i = mean[i,:]
-                    mu_j = mean[j,:]
-                    var_i = variance[i,:]
-                    var_j = variance[j,:]
-                    sv = var_i + var_j
-
-                    # cross covariance
-                    cross_params['covariance'][i, j, :, q] = 2 * (var_i * var_j) / sv
-                    # cross mean
-                    cross_mean_num = var_i.dot(mu_j) + var_j.dot(mu_i)
-                    cross_params['mean'][i, j, :, q] = cross_mean_num / sv
-                    # cross magnitude
-                    exp_term = -1/4 * ((mu_i - mu_j)**2 / sv).sum()
-                    cross_params['magnitude'][i, j, q] = w_i * w_j * np.exp(exp_term)
-            if m>1:
-                # cross phase
-                phase_q = self.model.kernel[q].phase.numpy()
-                cross_params['phase'][:, :, q] = np.subtract.outer(phase_q, phase_q)
-                for n in range(d):
-                    # cross delay        
-                    delay_n_q = self.model.kernel[q].delay.numpy()[:,n]
-                    cross_params['delay'][:, :, n, q] = np.subtract.outer(delay_n_q, delay_n_q)
-
+        cross_params['covariance'] = np.transpose(2 * (var_i * var_j) / sv, (1,2,3,0))
+        cross_params['mean'] = np.transpose((var_i * mu_j + var_j * mu_i) / sv, (1,2,3,0))
+        exp_term = -1/4 * np.einsum('qijd,qijd->qij', (mu_i - mu_j)**2, 1.0/sv)  # fuses the division and the sum over D
+        cross_params['magnitude'] = np.transpose(magnitude[:,:,None] * magnitude[:,None,:] * np.exp(exp_term), (1,2,0))
+        if m>1:
+            delay = self._get_param_across('delay')  # QxMxD
+            phase = self._get_param_across('phase')  # QxM
+            cross_params['delay'] = np.transpose(delay[:,:,None,:] - delay[:,None,:,:], (1,2,3,0))
+            cross_params['phase'] = np.transpose(phase[:,:,None] - phase[:,None,:], (1,2,0))
+        else:
+            # single channel kernels have no delay and phase
+            cross_params['delay'] = np.zeros((m, m, d, Q))
+            cross_params['phase'] = np.zeros((m, m, Q))
         return cross_params
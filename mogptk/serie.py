@@ -153,7 +153,7 @@ class Serie(np.ndarray):
             obj.apply(transformers, x)
         else:
             obj.transformed = transformed
-            obj.transformers = obj.transformers
+            obj.transformers = list(transformers)
 
         obj.flags['WRITEABLE'] = False
         obj.transformed.flags['WRITEABLE'] = False